@@ -0,0 +1,2 @@
+# Lets the tests import langgraph_code_generator without installing the package:
+# pytest puts the directory of this conftest.py on sys.path.
@@ -5,17 +5,49 @@ from typing import (
     List,
     Dict,
     Any,
+    Optional,
+    Tuple,
     Annotated,
     TypedDict,
+    TYPE_CHECKING,
 )
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_anthropic import ChatAnthropic
+import anthropic
 from langgraph.graph import StateGraph, END
-from e2b_code_interpreter import Sandbox
+from e2b_code_interpreter import Context, Sandbox
 from datetime import datetime
-import xml.etree.ElementTree as ET
 import textwrap
 import ast
+import re
+import threading
+import functools
+import random
+import time
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from .llm_cache import (
+        CacheBackend,
+        InMemoryCache,
+        SemanticCache,
+        SQLiteCache,
+        make_cache_key,
+    )
+except ImportError:
+    # Run as a script (example.py, visualize_graph.py) with only this directory
+    # on sys.path
+    from llm_cache import (
+        CacheBackend,
+        InMemoryCache,
+        SemanticCache,
+        SQLiteCache,
+        make_cache_key,
+    )
+
+if TYPE_CHECKING:
+    from graphviz import Digraph
 
 # Configure logging
 logging.basicConfig(
@@ -26,16 +58,368 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 try:
-    from graphviz import Digraph
+    # lxml parses with libxml2 and is preferred when installed
+    from lxml import etree as ET
+
+    # Review XML is model output, so never expand entities or fetch external
+    # resources (lxml only stopped resolving entities by default in 5.0)
+    _XML_PARSER = ET.XMLParser(resolve_entities=False, no_network=True)
 except ImportError:
-    logger.warning("Graphviz is not installed. Workflow graph visualization will not be available.")
+    import xml.etree.ElementTree as ET
+
+    # The standard library parser does not fetch external entities
+    _XML_PARSER = None
 
 
 MAX_RETRIES = 3  # Maximum number of generation attempts
 
+# SQLite file used to persist the response cache across runs. Responses are only
+# kept in memory when unset.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+# Serve repeated, identical review and test generation calls from the response
+# cache. Calls made with temperature=0 are always cached since they are
+# deterministic. Code generation is never cached. Setting LLM_CACHE_PATH also
+# enables the cache.
+LLM_CACHE_ENABLED = (
+    os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true" or bool(LLM_CACHE_PATH)
+)
+
+# Reuse approved code for prompts that are semantically similar to earlier ones
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+
+# Review code that ran successfully with the small model first, and only escalate
+# to the review model when the small model does not approve it
+FAST_REVIEW_ENABLED = os.getenv("FAST_REVIEW_ENABLED", "false").lower() == "true"
+
+# Output token budgets per step. Reviews and tests are short, while generation gets
+# a larger budget unless the prompt is short enough to imply a small function.
+GENERATION_MAX_TOKENS = 4096
+SHORT_PROMPT_GENERATION_MAX_TOKENS = 2048
+SHORT_PROMPT_LENGTH = 500
+REVIEW_MAX_TOKENS = 1024
+TEST_MAX_TOKENS = 2048
+
+# Retry policy for transient model API errors (rate limits, 5xx, connection errors)
+LLM_MAX_ATTEMPTS = 3
+LLM_BACKOFF_BASE = 1.0  # Seconds before the first retry
+LLM_BACKOFF_CAP = 30.0  # Upper bound on a single backoff delay
+LLM_BACKOFF_JITTER = 0.5  # Up to 50% random extra delay to avoid retry lockstep
+
+SANDBOX_POOL_SIZE = 4  # Maximum number of idle sandboxes kept warm between runs
+
+# Base directory for all packaged modules
+GENERATED_MODULES_DIR = os.path.join(os.path.dirname(__file__), "generated_modules")
+
+# Static system prompts. These are sent unchanged on every call so that
+# Anthropic can serve them from its prompt cache; keep dynamic content out of them.
+GENERATION_PROMPT = """You are a Python code generation agent. Generate ONLY the Python function code.
+DO NOT include any explanations, markdown formatting, or backticks.
+DO NOT include any text before or after the code.
+Start directly with 'def' and end with the last line of code.
+
+If sample data or test cases are provided in the prompt, make sure the function signature 
+matches the expected input format.
+
+Requirements:
+1. Well-structured and modular
+2. Include proper error handling
+3. Follow PEP 8 style guidelines
+4. Include docstrings
+5. Be efficient and maintainable
+"""
+
+REVIEW_PROMPT = """You are a code review agent. Review the Python code for:
+1. Code quality and best practices
+2. Potential bugs or issues
+3. Security concerns
+4. Performance considerations
+5. Documentation completeness
+6. Whether the code fulfills the stated requirements
+
+Do not approve code that does not do what the requirements ask.
+
+Provide your response in XML format like this:
+<review>
+    <approved>true/false</approved>
+    <issues>
+        <issue>Issue description 1</issue>
+        <issue>Issue description 2</issue>
+    </issues>
+    <suggestions>
+        <suggestion>Suggestion 1</suggestion>
+        <suggestion>Suggestion 2</suggestion>
+    </suggestions>
+</review>
+"""
+
+TEST_GENERATION_PROMPT = """Generate simple test code for the function provided by the user.
+IMPORTANT: 
+1. Return ONLY executable Python code
+2. DO NOT include any text comments or descriptions
+3. Use print statements for test output
+4. Include basic assertions
+5. Test both valid and invalid inputs
+6. Test edge cases appropriate for the function type
+
+Example test structure:
+print("Test valid inputs")
+result = function_name(<valid_input>)
+print(f"Input: <input>, Result: {result}")
+assert <condition>, "Test description"
+
+print("Test error cases")
+try:
+    function_name(<invalid_input>)
+    print("Error: Expected exception not raised")
+except <ExpectedException>:
+    print("Successfully caught expected error")
+"""
+
+# Markdown code fences and descriptive lines that models wrap around test code
+_FENCE_RE = re.compile(r"```(?:python)?")
+_NOISE_LINE_RE = re.compile(r"\s*(?:#|Here|Test|This)")
+
+# Blank or descriptive lines dropped from generated sample data, unless they
+# contain one of the test markers
+_DESCRIPTION_LINE_RE = re.compile(r"\s*(?:#|Here|This|Note|$)")
+_TEST_MARKER_RE = re.compile(r"print|assert|try:|except")
+
+# Test data section of a prompt: everything after a data marker, or the body of
+# a python code fence
+_TEST_DATA_RE = re.compile(
+    r"TEST DATA:(.*)|SAMPLE DATA:(.*)|TEST CASES:(.*)|```python(.*?)(?:```|\Z)",
+    re.DOTALL,
+)
+
+# The <review> element within a review response that may contain other text
+_REVIEW_ELEMENT_RE = re.compile(r"<review>.*</review>", re.DOTALL)
+
+# Elements of the review XML, used when the review is not well-formed XML
+_APPROVED_RE = re.compile(r"<approved>\s*(true|false)\s*</approved>", re.IGNORECASE)
+_ISSUE_RE = re.compile(r"<issue>(.*?)</issue>", re.DOTALL)
+_SUGGESTION_RE = re.compile(r"<suggestion>(.*?)</suggestion>", re.DOTALL)
+
+# Execution result fields shown by _format_execution_result, with their headings
+_EXECUTION_SECTIONS = (
+    ("stdout", "Output"),
+    ("stderr", "Errors"),
+    ("error", "Error Message"),
+)
+
+# Status lines of the formatted review and execution results, indexed by outcome
+_APPROVED_LINES = ("Approved: ❌ No", "Approved: ✅ Yes")
+_STATUS_LINES = ("Status: ❌ Failed", "Status: ✅ Success")
+
+# Summary shown by _format_review_result when no review was produced
+_NO_REVIEW_SUMMARY = "Code Review Summary:\n" + "-" * 20 + "\n(No review available)"
+
+# setup.py written alongside each packaged module
+SETUP_TEMPLATE = """from setuptools import setup, find_packages
+
+setup(
+    name="{module_name}",
+    version="0.1.0",
+    packages=find_packages(),
+    description="Generated Python module",
+)
+"""
+
+
+def _cacheable_system_message(prompt: str) -> SystemMessage:
+    """Wrap a static prompt in a system message marked as a prompt-cache breakpoint.
+
+    Anthropic only caches prefixes of at least 1024 tokens (2048 for Haiku
+    models). The prompts above are well under that, so the marker is ignored
+    until they grow past the minimum.
+    """
+    return SystemMessage(
+        content=[{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+    )
+
 
-def take_latest_reducer(a: str, b: str) -> str:
-    """Reducer that takes the latest value between two strings."""
+# System messages for each step, built once and shared by every call
+GENERATION_SYSTEM_MESSAGE = _cacheable_system_message(GENERATION_PROMPT)
+REVIEW_SYSTEM_MESSAGE = _cacheable_system_message(REVIEW_PROMPT)
+TEST_GENERATION_SYSTEM_MESSAGE = _cacheable_system_message(TEST_GENERATION_PROMPT)
+
+
+# Chat model clients shared by all CodeGeneratorModule instances, keyed by model name
+_models: Dict[str, ChatAnthropic] = {}
+_models_lock = threading.Lock()
+
+
+def _get_model(model_name: str) -> ChatAnthropic:
+    """Return the shared client for a model, creating it on first use."""
+    with _models_lock:
+        if model_name not in _models:
+            # Retries are handled by _invoke_with_backoff
+            _models[model_name] = ChatAnthropic(model=model_name, max_retries=0)
+        return _models[model_name]
+
+
+def _invoke_with_backoff(
+    model: ChatAnthropic, messages: List[BaseMessage], max_tokens: int
+) -> BaseMessage:
+    """Invoke a model, retrying transient API errors with exponential backoff and jitter."""
+    for attempt in range(LLM_MAX_ATTEMPTS):
+        try:
+            return model.invoke(messages, max_tokens=max_tokens)
+        except (anthropic.APIConnectionError, anthropic.APIStatusError) as e:
+            status = getattr(e, "status_code", None)
+            retryable = status is None or status == 429 or status >= 500
+            if not retryable or attempt == LLM_MAX_ATTEMPTS - 1:
+                raise
+            delay = min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * 2**attempt)
+            delay *= 1 + random.random() * LLM_BACKOFF_JITTER
+            logger.warning(
+                "Model call failed (%s), retrying in %.1fs (attempt %d/%d)",
+                e, delay, attempt + 1, LLM_MAX_ATTEMPTS,
+            )
+            time.sleep(delay)
+
+
+# Idle sandboxes shared by all CodeGeneratorModule instances, most recently used last
+_sandbox_pool: List[Sandbox] = []
+_sandbox_pool_lock = threading.Lock()
+
+# Acquires sandboxes in the background so VM start-up overlaps with model calls
+_sandbox_warmup_executor = ThreadPoolExecutor(thread_name_prefix="sandbox-warmup")
+
+
+def _kill_sandbox(sandbox: Sandbox) -> None:
+    """Kill a sandbox, logging rather than raising on failure."""
+    try:
+        sandbox.kill()
+    except Exception as e:
+        logger.warning("Error killing sandbox: %s", e)
+
+
+def _acquire_sandbox() -> Tuple[Sandbox, Optional[Context]]:
+    """Take a warm sandbox from the pool, creating a new one if none are available.
+
+    Each run executes in its own code context, since the sandbox's kernel would
+    otherwise keep the globals defined by earlier runs. The context is None only
+    for a new sandbox whose context could not be created; its default context is
+    still clean, but the sandbox must not be pooled afterwards.
+    """
+    while True:
+        with _sandbox_pool_lock:
+            if not _sandbox_pool:
+                break
+            sandbox = _sandbox_pool.pop()
+        # Pooled sandboxes may have hit their E2B timeout while idle
+        try:
+            if sandbox.is_running():
+                context = sandbox.create_code_context()
+                logger.info("Reusing pooled sandbox")
+                return sandbox, context
+        except Exception as e:
+            logger.warning("Discarding pooled sandbox: %s", e)
+        _kill_sandbox(sandbox)
+
+    logger.info("Creating new sandbox")
+    sandbox = Sandbox()
+    try:
+        context = sandbox.create_code_context()
+    except Exception as e:
+        logger.warning("Could not create code context, sandbox will not be pooled: %s", e)
+        context = None
+    return sandbox, context
+
+
+def _release_sandbox(sandbox: Sandbox, context: Optional[Context]) -> None:
+    """Return a sandbox to the pool once its code context is removed.
+
+    Sandboxes that cannot be cleaned are killed instead, so no run's state is
+    visible to a later one. The least recently used sandbox is killed if the
+    pool is full.
+    """
+    if context is None:
+        _kill_sandbox(sandbox)
+        return
+    try:
+        sandbox.remove_code_context(context)
+    except Exception as e:
+        logger.warning("Could not remove code context, killing sandbox: %s", e)
+        _kill_sandbox(sandbox)
+        return
+
+    with _sandbox_pool_lock:
+        _sandbox_pool.append(sandbox)
+        evicted = _sandbox_pool.pop(0) if len(_sandbox_pool) > SANDBOX_POOL_SIZE else None
+
+    if evicted is not None:
+        _kill_sandbox(evicted)
+
+
+@atexit.register
+def _drain_sandbox_pool() -> None:
+    """Kill idle pooled sandboxes on interpreter exit instead of leaving them to time out."""
+    with _sandbox_pool_lock:
+        sandboxes = _sandbox_pool[:]
+        _sandbox_pool.clear()
+
+    for sandbox in sandboxes:
+        _kill_sandbox(sandbox)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_review_xml(xml_string: str) -> Tuple[bool, Tuple[str, ...], Tuple[str, ...]]:
+    """Extract the approval flag, issues and suggestions from review XML.
+
+    Results are memoized by content, so a review that is seen again (e.g. served
+    from the response cache) is not re-parsed. Parse errors propagate and are
+    not cached.
+    """
+    # Models sometimes wrap the XML in prose or code fences, so parse only the
+    # <review> element, located in a single scan
+    match = _REVIEW_ELEMENT_RE.search(xml_string)
+    if match is not None:
+        xml_string = match.group(0)
+    # Pass bytes since lxml rejects str input that carries an encoding declaration
+    root = ET.fromstring(xml_string.encode(), _XML_PARSER)
+    approved = (root.findtext("approved") or "").strip().lower() == "true"
+    issues = tuple(issue.text for issue in root.findall("issues/issue"))
+    suggestions = tuple(
+        suggestion.text for suggestion in root.findall("suggestions/suggestion")
+    )
+    return approved, issues, suggestions
+
+
+@functools.lru_cache(maxsize=64)
+def _analyze_function(code: str) -> Tuple[str, Tuple[Tuple[str, Optional[str]], ...]]:
+    """Return the name and (parameter, annotation) pairs of the first top-level function.
+
+    Memoized by source text so code that comes back unchanged on a retry is not
+    parsed again. Raises if the code has no parseable function definition.
+    """
+    tree = ast.parse(code)
+    # Only module-level definitions are candidates, so there is no need to
+    # walk into class or function bodies
+    function_def = next(node for node in tree.body if isinstance(node, ast.FunctionDef))
+    params = tuple(
+        (arg.arg, getattr(arg.annotation, "id", None)) for arg in function_def.args.args
+    )
+    return function_def.name, params
+
+
+@functools.lru_cache(maxsize=64)
+def _syntax_error(source: str) -> Optional[str]:
+    """Return the syntax error in source as a string, or None if it compiles.
+
+    Memoized so code that comes back unchanged (e.g. from the response cache)
+    is not compiled again just to be validated.
+    """
+    try:
+        compile(source, "<string>", "exec")
+    except SyntaxError as e:
+        return str(e)
+    return None
+
+
+def take_latest_reducer(a: Any, b: Any) -> Any:
+    """Reducer that takes the latest of two values."""
     return b  # Always take the second (newer) value
 
 
@@ -48,198 +432,325 @@ class CodeGenerationState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     code: Annotated[str, take_latest_reducer]
     test_cases: Annotated[Dict, dict_merge_reducer]
-    execution_result: Annotated[Dict, dict_merge_reducer]
-    review_result: Annotated[Dict, dict_merge_reducer]
+    # Each execution and review writes a complete result, so these are replaced
+    # rather than merged with (and copied alongside) the previous attempt's
+    execution_result: Annotated[Dict, take_latest_reducer]
+    review_result: Annotated[Dict, take_latest_reducer]
     next: Annotated[str, take_latest_reducer]
     attempts: Annotated[int, operator.add]  # Track number of generation attempts
+    # Outcome flags of the latest execution and review, kept at the top level so
+    # routing does not have to look inside the result dicts
+    exec_success: Annotated[bool, take_latest_reducer]
+    review_approved: Annotated[bool, take_latest_reducer]
+
+
+def route_after_generate(state: CodeGenerationState) -> str:
+    """Route code that does not compile back to generation, skipping tests and execution."""
+    if _syntax_error(state["code"]) is None:
+        return "generate_sample_data"
+    if state["attempts"] >= MAX_RETRIES:
+        return END
+    return "generate"
+
+
+def route_after_execute(state: CodeGenerationState) -> str:
+    """Route to review on success, otherwise retry generation until MAX_RETRIES."""
+    if state["exec_success"]:
+        return "review"
+    if state["attempts"] >= MAX_RETRIES:
+        return END
+    return "generate"
+
+
+def route_after_review(state: CodeGenerationState) -> str:
+    """Route to packaging on approval, otherwise retry generation until MAX_RETRIES."""
+    if state["review_approved"]:
+        return "package"
+    if state["attempts"] >= MAX_RETRIES:
+        return END
+    return "generate"
 
 
 class CodeGeneratorModule:
+    # Default argument values used by fallback tests, keyed by annotation name
+    _TYPE_DEFAULTS = {
+        "int": "0",
+        "str": '"test"',
+        "float": "0.0",
+        "bool": "True",
+        "list": "[]",
+        "dict": "{}",
+    }
+
     def __init__(self):
         logger.info("Initializing CodeGeneratorModule")
 
-        # Initialize different models for different tasks
-        self.generation_model = ChatAnthropic(
-            model=os.getenv("ANTHROPIC_LARGE_MODEL", "claude-3-5-sonnet-20241022")
+        # Initialize different models for different tasks. Tasks that use the same
+        # model share one client and its HTTP connection pool.
+        self.generation_model = _get_model(
+            os.getenv("ANTHROPIC_LARGE_MODEL", "claude-3-5-sonnet-20241022")
         )
-        self.review_model = ChatAnthropic(
-            model=os.getenv("ANTHROPIC_LARGE_MODEL", "claude-3-5-sonnet-20241022")
+        # Review can be routed to a cheaper model via ANTHROPIC_REVIEW_MODEL
+        self.review_model = _get_model(
+            os.getenv("ANTHROPIC_REVIEW_MODEL")
+            or os.getenv("ANTHROPIC_LARGE_MODEL", "claude-3-5-sonnet-20241022")
         )
-        self.test_model = ChatAnthropic(
-            model=os.getenv("ANTHROPIC_SMALL_MODEL", "claude-3-5-haiku-20241022")
+        self.test_model = _get_model(
+            os.getenv("ANTHROPIC_SMALL_MODEL", "claude-3-5-haiku-20241022")
         )
 
-        self.sandbox = Sandbox()
+        # Sandbox is taken from the shared pool for the duration of generate_module.
+        # It is acquired in the background while code is being generated.
+        self.sandbox = None
+        self._sandbox_context: Optional[Context] = None
+        self._sandbox_future: Optional[Future] = None
+
+        # Execution results of the current generate_module run, keyed by the
+        # complete code that was executed
+        self._execution_results: Dict[str, Dict] = {}
+
+        # Cache of model responses keyed by model name and message contents
+        self._response_cache: CacheBackend = (
+            SQLiteCache(LLM_CACHE_PATH) if LLM_CACHE_PATH else InMemoryCache()
+        )
+        self._cache_stats = {"hits": 0, "misses": 0}
+
+        # Cache of approved code keyed by prompt embedding
+        self._semantic_cache = None
+        if SEMANTIC_CACHE_ENABLED:
+            if SemanticCache.is_available():
+                self._semantic_cache = SemanticCache()
+            else:
+                logger.warning(
+                    "sentence-transformers is not installed. Semantic caching will not be available."
+                )
 
         # Initialize the graph
         logger.info("Creating workflow graph")
         self.workflow = self._create_workflow()
 
+    def _invoke_model(
+        self,
+        model: ChatAnthropic,
+        messages: List[BaseMessage],
+        max_tokens: int,
+        use_cache: bool = True,
+    ) -> str:
+        """Invoke a model and return the response content, using the cache when enabled"""
+        cacheable = use_cache and (LLM_CACHE_ENABLED or model.temperature == 0)
+        if cacheable:
+            key = make_cache_key(model.model, messages, max_tokens)
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                logger.info("LLM response cache hit")
+                self._cache_stats["hits"] += 1
+                return cached
+            self._cache_stats["misses"] += 1
+
+        response = _invoke_with_backoff(model, messages, max_tokens)
+
+        if cacheable:
+            self._response_cache.set(key, response.content)
+        return response.content
+
     def _generate_code(self, state: CodeGenerationState) -> Dict:
         """Generate code based on the prompt"""
         logger.info("Starting code generation step")
 
-        # Get current attempt count
+        # Get current attempt count. The routes out of generate, execute and review
+        # end the workflow once MAX_RETRIES is reached, so generate is never entered
+        # past it.
         attempts = state.get("attempts", 0)
 
-        # Check if we've exceeded max retries
-        if attempts >= MAX_RETRIES:
-            logger.warning(f"Exceeded maximum retries ({MAX_RETRIES}), ending workflow")
-            return {"next": END}
-
-        prompt = """You are a Python code generation agent. Generate ONLY the Python function code.
-DO NOT include any explanations, markdown formatting, or backticks.
-DO NOT include any text before or after the code.
-Start directly with 'def' and end with the last line of code.
-
-If sample data or test cases are provided in the prompt, make sure the function signature 
-matches the expected input format.
-
-Requirements:
-1. Well-structured and modular
-2. Include proper error handling
-3. Follow PEP 8 style guidelines
-4. Include docstrings
-5. Be efficient and maintainable
-"""
-
         # Get the last message from the state
         last_message = state["messages"][-1]
-        logger.info(f"Processing user prompt: {last_message.content[:100]}...")
+        logger.info("Processing user prompt: %s...", last_message.content[:100])
+
+        # Reuse approved code from a similar earlier prompt on the first attempt
+        if attempts == 0 and self._semantic_cache is not None:
+            cached_code = self._semantic_cache.get(last_message.content)
+            if cached_code is not None:
+                logger.info("Semantic cache hit, reusing previously approved code")
+                return {"code": cached_code, "next": "execute", "attempts": attempts + 1}
 
         # Generate code using the larger model
-        logger.info(f"Generating code (attempt {attempts + 1}/{MAX_RETRIES})")
-        response = self.generation_model.invoke(
-            [HumanMessage(content=prompt), last_message]
+        logger.info("Generating code (attempt %s/%s)", attempts + 1, MAX_RETRIES)
+        # Generation is never served from the exact response cache: a cached
+        # response may be code that was later rejected, and retries need a fresh
+        # sample. Approved code is reused through the semantic cache instead.
+        code = self._invoke_model(
+            self.generation_model,
+            [GENERATION_SYSTEM_MESSAGE, last_message],
+            max_tokens=(
+                SHORT_PROMPT_GENERATION_MAX_TOKENS
+                if len(last_message.content) < SHORT_PROMPT_LENGTH
+                else GENERATION_MAX_TOKENS
+            ),
+            use_cache=False,
         )
 
         # Update state with generated code and increment attempts
         logger.info("Code generation complete")
-        return {
-            "code": response.content,
+        result = {
+            "code": code,
             "next": "execute",
             "attempts": attempts + 1,  # Increment the existing count
         }
 
+        # Code that does not compile is routed back here by route_after_generate,
+        # so record the error as its execution result
+        syntax_error = _syntax_error(code)
+        if syntax_error is not None:
+            logger.warning("Generated code has syntax error: %s", syntax_error)
+            result["execution_result"] = {"success": False, "error": syntax_error}
+            result["exec_success"] = False
+            result["next"] = "generate"
+
+        return result
+
     def _review_code(self, state: CodeGenerationState) -> Dict:
         """Review the code using the code review agent"""
         logger.info("Starting code review step")
-        prompt = """You are a code review agent. Review the Python code for:
-1. Code quality and best practices
-2. Potential bugs or issues
-3. Security concerns
-4. Performance considerations
-5. Documentation completeness
-
-Provide your response in XML format like this:
-<review>
-    <approved>true/false</approved>
-    <issues>
-        <issue>Issue description 1</issue>
-        <issue>Issue description 2</issue>
-    </issues>
-    <suggestions>
-        <suggestion>Suggestion 1</suggestion>
-        <suggestion>Suggestion 2</suggestion>
-    </suggestions>
-</review>
-"""
+        # Include the original request so code reused from the semantic cache,
+        # which was written for a similar but not identical prompt, is checked
+        # against what was actually asked for
+        review_message = f"""Requirements:
+{state['messages'][0].content}
 
-        review_message = f"""Review the following Python code:
+Review the following Python code:
 
 {state['code']}
 
 Execution result:
 {state['execution_result']}
 """
-        logger.info("Reviewing code with LLM")
-        review_result = self.review_model.invoke(
-            [HumanMessage(content=prompt), HumanMessage(content=review_message)]
-        )
+        messages = [REVIEW_SYSTEM_MESSAGE, HumanMessage(content=review_message)]
 
-        # Parse the XML response using string operations
-        content = review_result.content
-        approved = (
-            "true" in content.lower() and "<approved>true</approved>" in content.lower()
-        )
+        approved = False
+        if FAST_REVIEW_ENABLED and state["execution_result"].get("success"):
+            logger.info("Reviewing code with the small model")
+            approved, issues, suggestions, content = self._run_review(
+                self.test_model, messages
+            )
+            if not approved:
+                logger.info("Small model did not approve, escalating review")
 
-        logger.info(f"Code review complete. Approved: {approved}")
+        if not approved:
+            logger.info("Reviewing code with LLM")
+            approved, issues, suggestions, content = self._run_review(
+                self.review_model, messages
+            )
+
+        logger.info("Code review complete. Approved: %s", approved)
         return {
-            "review_result": {"approved": approved, "raw_review": content},
+            "review_result": {
+                "approved": approved,
+                "raw_review": content,
+                "issues": issues,
+                "suggestions": suggestions,
+            },
+            "review_approved": approved,
             "next": "package" if approved else "generate",
         }
 
+    def _run_review(
+        self, model: ChatAnthropic, messages: List[BaseMessage]
+    ) -> Tuple[bool, List[str], List[str], str]:
+        """Request a review from model and extract (approved, issues, suggestions, raw XML)"""
+        content = self._invoke_model(model, messages, max_tokens=REVIEW_MAX_TOKENS)
+
+        # Parse the review once and keep the structured result for formatting
+        try:
+            approved, issues, suggestions = _parse_review_xml(content)
+            issues, suggestions = list(issues), list(suggestions)
+        except Exception as e:
+            # Not well-formed XML, so pull the individual elements out of the
+            # raw text instead
+            logger.warning("Could not parse review XML: %s", e)
+            match = _APPROVED_RE.search(content)
+            approved = bool(match) and match.group(1).lower() == "true"
+            issues = _ISSUE_RE.findall(content)
+            suggestions = _SUGGESTION_RE.findall(content)
+
+        return approved, issues, suggestions, content
+
     def _execute_code(self, state: CodeGenerationState) -> Dict:
         """Execute the generated code in the e2b sandbox"""
         logger.info("Starting code execution step")
         try:
-            # Clean up test cases before execution
+            # Test cases were already cleaned when they were generated
             test_code = state.get("test_cases", {}).get("code", "")
-            # Remove any markdown or comment markers
-            test_code = test_code.replace("```python", "").replace("```", "")
-            # Remove any lines that start with comments or descriptions
-            test_code = "\n".join(
-                line for line in test_code.splitlines()
-                if not (line.strip().startswith(("#", "Here", "Test", "This"))
-                       and "print" not in line)
-            )
-            
-            # Combine function code with cleaned test cases
-            complete_code = f"{state['code']}\n\n{test_code}"
 
-            # Log the complete code being executed
-            logger.info(f"Executing code:\n{complete_code}")
+            # Combine function code with cleaned test cases, if there are any
+            complete_code = f"{state['code']}\n\n{test_code}" if test_code else state["code"]
 
-            execution = self.sandbox.run_code(complete_code)
-            success = not bool(execution.error)
-            logger.info(f"Code execution complete. Success: {success}")
+            # A retry that regenerated identical code and tests gets the result
+            # of the earlier run instead of executing it again
+            execution_result = self._execution_results.get(complete_code)
+            if execution_result is not None:
+                logger.info("Code already executed in this run, reusing result")
+            else:
+                # Log the complete code being executed
+                logger.info("Executing code:\n%s", complete_code)
 
-            result = {
-                "execution_result": {
-                    "success": success,
+                execution = self._get_sandbox().run_code(
+                    complete_code, context=self._sandbox_context
+                )
+                execution_result = {
+                    "success": not bool(execution.error),
                     "stdout": execution.logs.stdout,
                     "stderr": execution.logs.stderr,
                     "error": execution.error,
                 }
-            }
+                self._execution_results[complete_code] = execution_result
+
+            success = execution_result["success"]
+            logger.info("Code execution complete. Success: %s", success)
+
+            result = {"execution_result": execution_result, "exec_success": success}
 
             if success:
                 logger.info("Execution successful, proceeding to review")
                 result["next"] = "review"
             else:
-                logger.warning(f"Execution failed with error: {execution.error}")
+                logger.warning("Execution failed with error: %s", execution_result["error"])
                 result["next"] = "generate"
 
             return result
 
         except Exception as e:
-            logger.error(f"Exception during code execution: {str(e)}")
+            logger.error("Exception during code execution: %s", e)
             return {
                 "execution_result": {"success": False, "error": str(e)},
+                "exec_success": False,
                 "next": "generate",
             }
 
+    def _get_sandbox(self) -> Sandbox:
+        """Return the sandbox for this run, waiting for the background warmup if needed"""
+        if self.sandbox is None:
+            self.sandbox, self._sandbox_context = self._sandbox_future.result()
+        return self.sandbox
+
+    def _clean_test_code(self, test_code: str) -> str:
+        """Strip markdown fences and descriptive lines from generated test code"""
+        # Remove any markdown code fences in a single pass
+        test_code = _FENCE_RE.sub("", test_code.strip())
+        # Remove non-code lines while preserving test markers, in one pass over
+        # the lines
+        return "\n".join(
+            line
+            for line in test_code.splitlines()
+            if (not _DESCRIPTION_LINE_RE.match(line) or _TEST_MARKER_RE.search(line))
+            and not (_NOISE_LINE_RE.match(line) and "print" not in line)
+        )
+
     def _extract_test_data(self, prompt: str) -> str:
         """Extract test data section from the prompt if it exists"""
-        test_markers = [
-            ("TEST DATA:", ""),
-            ("SAMPLE DATA:", ""),
-            ("TEST CASES:", ""),
-            ("```python", "```"),
-        ]
-
-        for start_marker, end_marker in test_markers:
-            if start_marker in prompt:
-                start_idx = prompt.find(start_marker) + len(start_marker)
-                if end_marker:
-                    end_idx = prompt.find(end_marker, start_idx)
-                    if end_idx == -1:
-                        end_idx = None
-                else:
-                    end_idx = None
-                return prompt[start_idx:end_idx].strip()
-
-        return ""
+        match = _TEST_DATA_RE.search(prompt)
+        if match is None:
+            return ""
+        return next(group for group in match.groups() if group is not None).strip()
 
     def _package_code(self, state: CodeGenerationState) -> Dict:
         """Package the approved code into a Python module"""
@@ -248,103 +759,74 @@ Execution result:
             # Create timestamp for file naming
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Create base directory for all generated modules if it doesn't exist
-            base_dir = os.path.join(os.path.dirname(__file__), "generated_modules")
-            logger.info(f"Creating {base_dir} directory")
-            os.makedirs(base_dir, exist_ok=True)
-
-            # Create timestamped module directory
+            # Create the timestamped module directory, along with the base
+            # directory for all generated modules, in a single call
             module_name = f"generated_module_{timestamp}"
-            module_path = os.path.join(base_dir, module_name)
+            module_path = os.path.join(GENERATED_MODULES_DIR, module_name)
+            logger.info("Creating %s directory", module_path)
             os.makedirs(module_path, exist_ok=True)
 
-            # Write the code to both a standalone file and the module
-            standalone_file = os.path.join(module_path, f"code_generated_{timestamp}.py")
-            logger.info(f"Writing code to {standalone_file}")
-            with open(standalone_file, "w") as f:
-                f.write(state["code"])
-
-            # Write the code to __init__.py in the module directory
-            logger.info(f"Writing code to {module_path}/__init__.py")
-            with open(os.path.join(module_path, "__init__.py"), "w") as f:
-                f.write(state["code"])
-
-            # Create setup.py
-            logger.info(f"Creating {module_path}/setup.py")
-            setup_content = f"""
-from setuptools import setup, find_packages
-
-setup(
-    name="{module_name}",
-    version="0.1.0",
-    packages=find_packages(),
-    description="Generated Python module",
-)
-"""
-            with open(os.path.join(module_path, "setup.py"), "w") as f:
-                f.write(setup_content)
-
+            standalone_name = f"code_generated_{timestamp}"
+            standalone_file = os.path.join(module_path, f"{standalone_name}.py")
+            setup_content = SETUP_TEMPLATE.format(module_name=module_name)
+
+            # Write the code once to a standalone file. The module's __init__.py
+            # re-exports it instead of holding a second copy.
+            files = [
+                (standalone_file, state["code"]),
+                (
+                    os.path.join(module_path, "__init__.py"),
+                    f"from .{standalone_name} import *  # noqa: F401,F403\n",
+                ),
+                (os.path.join(module_path, "setup.py"), setup_content),
+            ]
+            for path, content in files:
+                logger.info("Writing %s", path)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            if self._semantic_cache is not None:
+                self._semantic_cache.set(state["messages"][-1].content, state["code"])
+
+            # Resolve the module directory against the cwd once and derive the
+            # file path from it rather than calling relpath for each path
+            module_rel = os.path.relpath(module_path)
             logger.info("Code packaging complete")
             return {
                 "next": END,
                 "package_info": {
-                    "standalone_file": os.path.relpath(standalone_file),
-                    "module_path": os.path.relpath(module_path),
+                    "standalone_file": os.path.join(module_rel, f"{standalone_name}.py"),
+                    "module_path": module_rel,
                 },
             }
 
         except Exception as e:
-            logger.error(f"Error during code packaging: {str(e)}")
+            logger.error("Error during code packaging: %s", e)
             return {"next": END}  # End even on error to prevent loops
 
     def _generate_sample_data(self, state: CodeGenerationState) -> Dict:
         """Generate and format test cases for the code"""
         logger.info("Starting test case generation step")
 
-        # Extract existing test data if provided
-        existing_test_data = self._extract_test_data(state["messages"][0].content)
+        # Extract existing test data if provided. The prompt does not change
+        # between attempts, so reuse the data extracted on the first attempt.
+        test_cases = state.get("test_cases", {})
+        if "original_data" in test_cases:
+            existing_test_data = test_cases["original_data"]
+        else:
+            existing_test_data = self._extract_test_data(state["messages"][0].content)
 
         # Extract function name and signature from the code
         code = state["code"]
         try:
-            tree = ast.parse(code)
-            function_def = next(node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef))
-            function_name = function_def.name
-            
-            # Analyze parameters
-            params = []
-            for arg in function_def.args.args:
-                param_name = arg.arg
-                param_type = arg.annotation.id if hasattr(arg, 'annotation') and hasattr(arg.annotation, 'id') else None
-                params.append((param_name, param_type))
-            
-            logger.info(f"Analyzing function: {function_name} with params: {params}")
+            function_name, params = _analyze_function(code)
+            logger.info("Analyzing function: %s with params: %s", function_name, params)
         except Exception as e:
-            logger.error(f"Error analyzing function signature: {e}")
+            logger.error("Error analyzing function signature: %s", e)
             function_name = "function"
             params = []
 
-        prompt = f"""Generate simple test code for the following function.
-IMPORTANT: 
-1. Return ONLY executable Python code
-2. DO NOT include any text comments or descriptions
-3. Use print statements for test output
-4. Include basic assertions
-5. Test both valid and invalid inputs
-6. Test edge cases appropriate for the function type
-
-Example test structure:
-print("Test valid inputs")
-result = {function_name}(<valid_input>)
-print(f"Input: <input>, Result: {{result}}")
-assert <condition>, "Test description"
-
-print("Test error cases")
-try:
-    {function_name}(<invalid_input>)
-    print("Error: Expected exception not raised")
-except <ExpectedException>:
-    print("Successfully caught expected error")
+        test_message = f"""Function name: {function_name}
 
 Function to test:
 {code}
@@ -355,31 +837,22 @@ Existing test data:
 
         try:
             # Use the smaller model for test case generation
-            response = self.test_model.invoke([HumanMessage(content=prompt)])
+            response = self._invoke_model(
+                self.test_model,
+                [
+                    TEST_GENERATION_SYSTEM_MESSAGE,
+                    HumanMessage(content=test_message),
+                ],
+                max_tokens=TEST_MAX_TOKENS,
+            )
 
             # Clean up the response
-            test_code = response.content.strip()
-            test_code = test_code.replace("```python", "").replace("```", "")
-
-            # Remove non-code lines while preserving test markers
-            test_code = "\n".join(
-                line
-                for line in test_code.splitlines()
-                if (
-                    line.strip() 
-                    and not line.strip().startswith(("#", "Here", "This", "Note"))
-                    or "print" in line
-                    or "assert" in line
-                    or "try:" in line
-                    or "except" in line
-                )
-            )
+            test_code = self._clean_test_code(response)
 
             # Validate the test code
-            try:
-                compile(test_code, '<string>', 'exec')
-            except SyntaxError as e:
-                logger.error(f"Generated test code has syntax error: {e}")
+            syntax_error = _syntax_error(test_code)
+            if syntax_error is not None:
+                logger.error("Generated test code has syntax error: %s", syntax_error)
                 # Generate minimal fallback test based on function signature
                 fallback_test = self._generate_fallback_test(function_name, params)
                 test_code = fallback_test
@@ -390,7 +863,7 @@ Existing test data:
                 "next": "execute",
             }
         except Exception as e:
-            logger.error(f"Error generating test cases: {str(e)}")
+            logger.error("Error generating test cases: %s", e)
             fallback_test = self._generate_fallback_test(function_name, params)
             return {
                 "test_cases": {
@@ -402,27 +875,11 @@ Existing test data:
 
     def _generate_fallback_test(self, function_name: str, params: List[tuple]) -> str:
         """Generate minimal fallback test based on function signature"""
-        # Generate default test values based on parameter types
-        test_values = []
-        for param_name, param_type in params:
-            if param_type == 'int':
-                test_values.append('0')
-            elif param_type == 'str':
-                test_values.append('"test"')
-            elif param_type == 'float':
-                test_values.append('0.0')
-            elif param_type == 'bool':
-                test_values.append('True')
-            elif param_type == 'list':
-                test_values.append('[]')
-            elif param_type == 'dict':
-                test_values.append('{}')
-            else:
-                test_values.append('None')
-        
-        # If no parameters were found, use a simple value
-        if not test_values:
-            test_values = ['0']
+        # Generate default test values based on parameter types, or a simple
+        # value if no parameters were found
+        test_values = [
+            self._TYPE_DEFAULTS.get(param_type, "None") for _, param_type in params
+        ] or ["0"]
 
         return f"""
 print("Basic function test")
@@ -445,30 +902,16 @@ print(f"Result: {{result}}")
         # Add edges
         logger.info("Adding workflow edges")
 
-        # After generate, go to generate_sample_data
-        workflow.add_edge("generate", "generate_sample_data")
+        # After generate, go to generate_sample_data unless the code does not compile
+        workflow.add_conditional_edges("generate", route_after_generate)
 
         # After generate_sample_data, go to execute
         workflow.add_edge("generate_sample_data", "execute")
 
         # After execute, conditionally route based on success
-        def route_after_execute(state: CodeGenerationState) -> str:
-            if state["execution_result"].get("success", False):
-                return "review"
-            if state["attempts"] >= MAX_RETRIES:
-                return END
-            return "generate"
-
         workflow.add_conditional_edges("execute", route_after_execute)
 
         # After review, conditionally route based on approval
-        def route_after_review(state: CodeGenerationState) -> str:
-            if state["review_result"].get("approved", False):
-                return "package"
-            if state["attempts"] >= MAX_RETRIES:
-                return END
-            return "generate"
-
         workflow.add_conditional_edges("review", route_after_review)
 
         # Package always ends the workflow
@@ -481,12 +924,17 @@ print(f"Result: {{result}}")
 
     def _format_review_result(self, review_result: Dict) -> str:
         """Format the review result XML into a readable string."""
-        try:
-            # Get the raw XML review
-            xml_string = review_result.get("raw_review", "")
+        # The workflow can end before any review ran, e.g. when execution
+        # failed on every attempt
+        if not review_result.get("raw_review"):
+            return _NO_REVIEW_SUMMARY
 
-            # Parse the XML
-            root = ET.fromstring(xml_string)
+        try:
+            # _review_code always stores the extracted elements, even when the
+            # XML was malformed, so the raw review never needs parsing here
+            approved = review_result.get("approved", False)
+            issues = review_result.get("issues") or []
+            suggestions = review_result.get("suggestions") or []
 
             # Format the review
             formatted = []
@@ -494,22 +942,19 @@ print(f"Result: {{result}}")
             formatted.append("-" * 20)
 
             # Add approval status
-            approved = root.find("approved").text.lower() == "true"
-            formatted.append(f"Approved: {'✅ Yes' if approved else '❌ No'}")
+            formatted.append(_APPROVED_LINES[bool(approved)])
 
             # Add issues
-            issues = root.find("issues")
-            if issues is not None and len(issues):
+            if issues:
                 formatted.append("\nIssues Found:")
-                for issue in issues.findall("issue"):
-                    formatted.append(f"• {issue.text}")
+                for issue in issues:
+                    formatted.append(f"• {issue}")
 
             # Add suggestions
-            suggestions = root.find("suggestions")
-            if suggestions is not None and len(suggestions):
+            if suggestions:
                 formatted.append("\nSuggestions:")
-                for suggestion in suggestions.findall("suggestion"):
-                    formatted.append(f"• {suggestion.text}")
+                for suggestion in suggestions:
+                    formatted.append(f"• {suggestion}")
 
             return "\n".join(formatted)
         except Exception as e:
@@ -523,44 +968,29 @@ print(f"Result: {{result}}")
 
         # Add execution status
         success = execution_result.get("success", False)
-        formatted.append(f"Status: {'✅ Success' if success else '❌ Failed'}")
-
-        # Add stdout if present
-        if stdout := execution_result.get("stdout"):
-            formatted.append("\nOutput:")
-            # Handle both string and list outputs
-            if isinstance(stdout, list):
-                formatted.extend(str(line) for line in stdout)
-            else:
-                formatted.append(str(stdout))
-
-        # Add stderr if present
-        if stderr := execution_result.get("stderr"):
-            formatted.append("\nErrors:")
-            # Handle both string and list outputs
-            if isinstance(stderr, list):
-                formatted.extend(str(line) for line in stderr)
-            else:
-                formatted.append(str(stderr))
-
-        # Add error if present
-        if error := execution_result.get("error"):
-            formatted.append("\nError Message:")
-            # Handle both string and list outputs
-            if isinstance(error, list):
-                formatted.extend(str(line) for line in error)
-            else:
-                formatted.append(str(error))
+        formatted.append(_STATUS_LINES[bool(success)])
+
+        # Add each output section that is present, handling both string and
+        # list values
+        for key, title in _EXECUTION_SECTIONS:
+            if value := execution_result.get(key):
+                formatted.append(f"\n{title}:")
+                if isinstance(value, list):
+                    formatted.append("\n".join(map(str, value)))
+                else:
+                    formatted.append(str(value))
 
         return "\n".join(formatted)
 
     def generate_module(self, prompt: str) -> Dict[str, Any]:
         """Generate a Python module from a prompt"""
         logger.info("Starting module generation process")
-        logger.info(f"Initial prompt: {prompt[:100]}...")
+        logger.info("Initial prompt: %s...", prompt[:100])
 
-        # Remove any common leading whitespace from the prompt
-        prompt = textwrap.dedent(prompt)
+        # Remove any common leading whitespace from the prompt. If the prompt
+        # starts with a non-whitespace character there is no common margin.
+        if prompt[:1].isspace():
+            prompt = textwrap.dedent(prompt)
 
         initial_state = {
             "messages": [HumanMessage(content=prompt)],
@@ -570,16 +1000,24 @@ print(f"Result: {{result}}")
             "review_result": {},
             "next": "generate",
             "attempts": 0,
+            "exec_success": False,
+            "review_approved": False,
         }
 
+        # Results from an earlier run came from a different sandbox
+        self._execution_results.clear()
+        # Cache statistics are logged per run
+        self._cache_stats = {"hits": 0, "misses": 0}
+
         try:
+            # Start the sandbox now so it is ready by the time code is executed
+            self._sandbox_future = _sandbox_warmup_executor.submit(_acquire_sandbox)
+
             logger.info("Invoking workflow")
             result = self.workflow.invoke(initial_state)
 
             # Check if we actually succeeded
-            if not result.get("execution_result", {}).get(
-                "success", False
-            ) or not result.get("review_result", {}).get("approved", False):
+            if not (result["exec_success"] and result["review_approved"]):
                 logger.warning("Module generation failed validation checks")
                 return {
                     "success": False,
@@ -601,18 +1039,33 @@ print(f"Result: {{result}}")
                 "package_info": result.get("package_info", {})
             }
         except Exception as e:
-            logger.error(f"Error during module generation: {str(e)}")
+            logger.error("Error during module generation: %s", e)
             return {"success": False, "error": str(e)}
         finally:
-            logger.info("Cleaning up sandbox")
-            self.sandbox.kill()
+            if self._sandbox_future is not None:
+                try:
+                    sandbox = self._get_sandbox()
+                except Exception as e:
+                    logger.error("Error acquiring sandbox: %s", e)
+                else:
+                    logger.info("Releasing sandbox")
+                    _release_sandbox(sandbox, self._sandbox_context)
+                self.sandbox = None
+                self._sandbox_context = None
+                self._sandbox_future = None
+            if self._cache_stats["hits"] or self._cache_stats["misses"]:
+                logger.info(
+                    "LLM response cache: %d hits, %d misses",
+                    self._cache_stats["hits"],
+                    self._cache_stats["misses"],
+                )
 
-    def visualize_workflow(self, output_file: str = "workflow_graph.png") -> None:
-        """Generate a visualization of the workflow graph.
+    @functools.cached_property
+    def _workflow_graph(self) -> "Digraph":
+        """Graphviz rendering of the workflow, built once per instance"""
+        # Imported here so that graphviz is only loaded when visualizing
+        from graphviz import Digraph
 
-        Args:
-            output_file: Path where the PNG file should be saved
-        """
         dot = Digraph(comment="Code Generation Workflow")
         dot.attr(rankdir="LR")  # Left to right layout
 
@@ -631,10 +1084,14 @@ print(f"Result: {{result}}")
             dot.node(node, node, shape=shape)
 
         # Add edges
-        dot.edge("generate", "generate_sample_data")
         dot.edge("generate_sample_data", "execute")
 
         # Add conditional edges with different colors
+        # Generate -> Generate Sample Data (compiles) or Generate (syntax error)
+        dot.edge("generate", "generate_sample_data", color="green", label="compiles")
+        dot.edge("generate", "generate", color="red", label="syntax error")
+        dot.edge("generate", "END", color="blue", label="max retries")
+
         # Execute -> Review (success) or Generate (failure)
         dot.edge("execute", "review", color="green", label="success")
         dot.edge("execute", "generate", color="red", label="failure")
@@ -648,6 +1105,19 @@ print(f"Result: {{result}}")
         # Package always ends
         dot.edge("package", "END")
 
-        # Save the graph
+        return dot
+
+    def visualize_workflow(self, output_file: str = "workflow_graph.png") -> None:
+        """Generate a visualization of the workflow graph.
+
+        Args:
+            output_file: Path where the PNG file should be saved
+        """
+        try:
+            dot = self._workflow_graph
+        except ImportError:
+            logger.warning("Graphviz is not installed. Workflow graph visualization is not available.")
+            return
+
         dot.render(output_file, format="png", cleanup=True)
-        logger.info(f"Workflow graph visualization saved to {output_file}.png")
+        logger.info("Workflow graph visualization saved to %s.png", output_file)
@@ -1,4 +1,3 @@
-import os
 from dotenv import load_dotenv
 from code_generator import CodeGeneratorModule
 import textwrap
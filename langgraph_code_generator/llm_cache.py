@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Protocol, Tuple
+
+from langchain_core.messages import BaseMessage
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached LLM responses."""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+
+class InMemoryCache:
+    """Cache backend that keeps responses in a process-local LRU dictionary."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._store.get(key)
+        if value is not None:
+            self._store.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._store[key] = value
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+
+class SQLiteCache:
+    """Cache backend that persists responses in a SQLite file, so they survive across runs."""
+
+    def __init__(self, path: str):
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value)
+            )
+
+
+class SemanticCache:
+    """Cache that matches prompts by embedding similarity instead of exact text.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry is
+    evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._encoder = None
+        self._entries: "OrderedDict[str, Tuple[List[float], str, float]]" = OrderedDict()
+        self._last_embedding: Tuple[str, List[float]] = ("", [])
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether the embedding model dependency is installed."""
+        return SentenceTransformer is not None
+
+    def _embed(self, text: str) -> List[float]:
+        # get() and set() are usually called with the same prompt, so remember
+        # the last embedding instead of encoding it twice
+        if self._last_embedding[0] == text:
+            return self._last_embedding[1]
+        if self._encoder is None:
+            self._encoder = SentenceTransformer(self.model_name)
+        embedding = [float(x) for x in self._encoder.encode(text, normalize_embeddings=True)]
+        self._last_embedding = (text, embedding)
+        return embedding
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the value stored for the most similar prompt above the threshold."""
+        if not self._entries:
+            return None
+
+        query = self._embed(prompt)
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+        for key, (embedding, _, created) in list(self._entries.items()):
+            if now - created > self.ttl_seconds:
+                del self._entries[key]
+                continue
+            # Embeddings are normalized, so the dot product is the cosine similarity
+            score = sum(a * b for a, b in zip(query, embedding))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][1]
+
+    def set(self, prompt: str, value: str) -> None:
+        self._entries[prompt] = (self._embed(prompt), value, time.monotonic())
+        self._entries.move_to_end(prompt)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Version of the cache key format. Keys are persisted by SQLiteCache, so bump this
+# whenever the payload or its serialization changes
+CACHE_KEY_VERSION = 1
+
+
+def make_cache_key(
+    model_name: str, messages: List[BaseMessage], max_tokens: Optional[int] = None
+) -> str:
+    """Build a deterministic cache key for a model call."""
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "model": model_name,
+        "messages": [(message.type, message.content) for message in messages],
+        "max_tokens": max_tokens,
+    }
+    serialized = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(serialized).hexdigest()
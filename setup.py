@@ -8,6 +8,7 @@ except FileNotFoundError:
     required = [
         'langchain-core',
         'langchain-anthropic',
+        'anthropic',
         'langgraph',
         'e2b',
         'graphviz',  # Optional dependency for visualization
@@ -34,5 +35,7 @@ setup(
     ],
     extras_require={
         'viz': ['graphviz'],  # Optional dependency for visualization
+        'xml': ['lxml'],  # Optional faster XML parser for reviews
+        'semantic': ['sentence-transformers'],  # Optional semantic cache of approved code
     }
 ) 
\ No newline at end of file
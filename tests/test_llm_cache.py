@@ -0,0 +1,58 @@
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from langgraph_code_generator import llm_cache
+from langgraph_code_generator.llm_cache import InMemoryCache, SQLiteCache, make_cache_key
+
+
+def test_in_memory_cache_round_trip():
+    cache = InMemoryCache()
+    assert cache.get("missing") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_sqlite_cache_round_trip_and_overwrite(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    assert cache.get("missing") is None
+    cache.set("key", "value")
+    cache.set("key", "updated")
+    assert cache.get("key") == "updated"
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "cache.db")
+    SQLiteCache(path).set("key", "value")
+    assert SQLiteCache(path).get("key") == "value"
+
+
+def test_make_cache_key_is_deterministic():
+    messages = [SystemMessage(content="system"), HumanMessage(content="prompt")]
+    assert make_cache_key("model", messages, 100) == make_cache_key("model", list(messages), 100)
+
+
+def test_make_cache_key_depends_on_all_inputs():
+    messages = [HumanMessage(content="prompt")]
+    key = make_cache_key("model", messages, 100)
+    assert make_cache_key("other-model", messages, 100) != key
+    assert make_cache_key("model", [HumanMessage(content="other")], 100) != key
+    assert make_cache_key("model", [SystemMessage(content="prompt")], 100) != key
+    assert make_cache_key("model", messages, 200) != key
+    assert make_cache_key("model", messages) != key
+
+
+def test_make_cache_key_depends_on_format_version(monkeypatch):
+    messages = [HumanMessage(content="prompt")]
+    key = make_cache_key("model", messages, 100)
+    monkeypatch.setattr(llm_cache, "CACHE_KEY_VERSION", llm_cache.CACHE_KEY_VERSION + 1)
+    assert make_cache_key("model", messages, 100) != key